@@ -3,6 +3,8 @@
 #
 from .regdef import REGDEF
 
+__all__ = ['DELIMS']
+
 DELIMS = {
     'separator_delim': {*REGDEF['free_delim'], '(' },
     'and_or_delim': {'(', '!', '"', '-', '\'', '_', *REGDEF['alphanumeric'], *REGDEF['free_delim']},
@@ -32,4 +34,14 @@ DELIMS = {
     'zeru_delim': {*REGDEF['free_delim'], ';', ')', *REGDEF['arithmetic_operators'], *REGDEF['relational_operators']},
     'zara_delim': {*REGDEF['free_delim'], '(', ';'},
     'number_delim': {*REGDEF['general_operators'], *REGDEF['relational_operators'], ')', ']', '}', ';', ',', *REGDEF['free_delim']},
-}
\ No newline at end of file
+}
+
+# Freeze every delimiter class once at import. The lexer only ever reads these,
+# so immutable sets make that contract explicit and let states share them safely.
+DELIMS = {name: frozenset(chars) for name, chars in DELIMS.items()}
+
+# Several classes spell out the same chars (e.g. and_or/arithmetic/most_symbol);
+# intern them so equal classes are one shared object.
+_unique = {}
+DELIMS = {name: _unique.setdefault(chars, chars) for name, chars in DELIMS.items()}
+del _unique
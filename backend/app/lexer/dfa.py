@@ -0,0 +1,248 @@
+#
+# dfa.py
+#
+# Determinizes the transition diagram in `td.py` once at import.
+#
+# The diagram is an NFA: after each char the lexer can be in several states
+# at once (e.g. after '-' it is both the minus operator and a number's sign).
+# Subset construction gives every reachable set of NFA states a dense DFA id,
+# so the lexer moves one id per char with a single table lookup. States the
+# lexer can't tell apart are then merged to keep the tables small.
+#
+from .td import (
+    STATES, STATES_LIST, KEYWORDS, IDENT_STATES, NUMBER_STATES, ID_END_MASK,
+    ascii_mask, states_mask, walk,
+)
+from . import lexer_errors
+from .lexer_errors import UNCLOSED_COMMENT_MASK
+
+START_STATES = 1 # bitmask holding only state 0
+EOF = -1 # char code past the end of the source; never a real char
+
+# Columns of a DFA row: 0-127 are ASCII codes, NON_ASCII covers every other
+# char and the last column is EOF, so `row[EOF]` indexes it directly.
+NON_ASCII = 128
+EOF_COLUMN = 129
+COLUMNS = 130
+
+# Chars the lexer skips as whitespace before a scan starts. They never reach
+# the DFA, but their char class has to stay apart from the chars that do.
+WHITESPACE = ' \t\r\n'
+
+DEAD = -1 # DFA id for "no active states"
+
+def nfa_step(active_states: int, co: int):
+    """
+    Runs one step of the NFA from the `active_states` bitmask on the char
+    with code `co`, or on end of input when `co` is EOF. Returns
+    (next_active_states, accepted_end_states), both as bitmasks.
+    """
+    if co == EOF:
+        # The delimiter classes spell "end of input" as '\0'.
+        co = 0
+    accepted = 0
+    next_active_states = 0
+    m = active_states
+    while m:
+        low = m & -m
+        state = STATES_LIST[low.bit_length() - 1]
+        m ^= low
+        if co < 128:
+            accepted |= state.end_masks[co]
+            next_active_states |= state.nonend_masks[co]
+            continue
+        # Non-ASCII chars aren't in the tables; ask the states directly.
+        lookahead_char = chr(co)
+        for next_state_id, _ in state.end_branches:
+            if STATES_LIST[next_state_id].matches(lookahead_char):
+                accepted |= 1 << next_state_id
+        for next_state_id, _ in state.nonend_branches:
+            if STATES_LIST[next_state_id].matches(lookahead_char):
+                next_active_states |= 1 << next_state_id
+
+    return next_active_states, accepted
+
+def _non_ascii_code():
+    # Every non-ASCII char shares one column, which only holds while no
+    # char class names one; fail loudly at import if that ever changes.
+    for state in STATES.values():
+        if any(len(c) == 1 and ord(c) >= 128 for c in state.chars):
+            raise ValueError('char classes with non-ASCII members need their own DFA columns')
+    return 0x80
+
+def _build():
+    non_ascii = _non_ascii_code()
+    columns = [*range(128), non_ascii, EOF]
+
+    dfa_ids = {START_STATES: 0}
+    subsets = [START_STATES]
+    trans = []
+    accept = []
+    i = 0
+    while i < len(subsets):
+        active_states = subsets[i]
+        trans_row = []
+        accept_row = []
+        for co in columns:
+            next_active_states, accepted = nfa_step(active_states, co)
+            if co == EOF or not next_active_states:
+                # Nothing is read past the end of input.
+                trans_row.append(DEAD)
+            else:
+                if next_active_states not in dfa_ids:
+                    dfa_ids[next_active_states] = len(subsets)
+                    subsets.append(next_active_states)
+                trans_row.append(dfa_ids[next_active_states])
+            accept_row.append(accepted)
+        trans.append(trans_row)
+        accept.append(accept_row)
+        i += 1
+    return dfa_ids, subsets, trans, accept
+
+# NFA states lexer_errors tells apart, and those with an end state in reach;
+# an error only depends on which of these a DFA state holds.
+_ERROR_STATES_MASK = states_mask(
+    lexer_errors.UNFINISHED_FLUX_STATES | lexer_errors.UNCLOSED_STRING_STATES
+    | lexer_errors.UNCLOSED_CHAR_STATES | lexer_errors.UNCLOSED_COMMENT_STATES
+)
+_END_REACHABLE_MASK = states_mask(
+    i for i, state in enumerate(STATES_LIST) if state.isEnd or state.end_branches
+)
+
+def _accept_kind(accepted):
+    # All the lexer reads from an accepted mask: nothing, identifier only
+    # (force_id) or anything else.
+    if not accepted:
+        return 0
+    return 1 if (accepted | ID_END_MASK) == ID_END_MASK else 2
+
+def _minimize(dfa_ids, subsets, trans, accept):
+    """
+    Merges DFA states the lexer can't tell apart: same accept kinds per
+    column, same error behaviour and the same successors, found by
+    refining that partition until it stops splitting. Each merged state
+    keeps the NFA set and accept masks of its lowest id, so id 0 stays the
+    start state.
+    """
+    blocks = {}
+    block_of = [
+        blocks.setdefault((
+            tuple(map(_accept_kind, accept_row)),
+            active_states & _ERROR_STATES_MASK,
+            bool(active_states & _END_REACHABLE_MASK),
+        ), len(blocks))
+        for active_states, accept_row in zip(subsets, accept)
+    ]
+    # Equal columns split the same way, so refine on one of each.
+    distinct_cols = {}
+    for col in range(len(trans[0])):
+        distinct_cols.setdefault(tuple(trans_row[col] for trans_row in trans), col)
+    successors = [
+        [trans_row[col] for col in distinct_cols.values()] for trans_row in trans
+    ]
+    while True:
+        # The extra DEAD at the end makes DEAD (-1) map to itself.
+        lookup = (*block_of, DEAD).__getitem__
+        blocks = {}
+        refined = [
+            blocks.setdefault((block_of[i], tuple(map(lookup, row))), len(blocks))
+            for i, row in enumerate(successors)
+        ]
+        if len(blocks) == len(set(block_of)):
+            break
+        block_of = refined
+
+    first = {}
+    for i, block in enumerate(block_of):
+        first.setdefault(block, i)
+    keep = [first[block] for block in range(len(first))]
+    return (
+        {active_states: block_of[i] for active_states, i in dfa_ids.items()},
+        [subsets[i] for i in keep],
+        [[DEAD if t == DEAD else block_of[t] for t in trans[i]] for i in keep],
+        [accept[i] for i in keep],
+    )
+
+# DFA_IDS: NFA bitmask -> DFA id; DFA_STATES: DFA id -> NFA bitmask (kept
+# for error reporting, which still reasons about NFA states).
+# DFA_TRANS[id][col]: next DFA id, or DEAD.
+# DFA_ACCEPT[id][col]: bitmask of end states that accept with that char as
+# the lookahead, or 0.
+DFA_IDS, DFA_STATES, DFA_TRANS, DFA_ACCEPT = _minimize(*_build())
+DFA_START = 0
+
+# DFA states inside a block comment; at EOF these accept as a comment.
+DFA_UNCLOSED_COMMENT = [bool(s & UNCLOSED_COMMENT_MASK) for s in DFA_STATES]
+
+def _keyword_delims():
+    # A keyword is lexed as an identifier and only then looked up, which is
+    # only sound while every keyword delimiter also ends an identifier.
+    ident_delim = STATES[263].chars
+    delims = {}
+    for word, delim in KEYWORDS:
+        if not ident_delim.issuperset(delim):
+            raise ValueError(f'delimiters of {word!r} must also end an identifier')
+        # As DFA columns: '\0' stands for both a NUL char and end of input.
+        delims[word] = ascii_mask(delim) | ((1 << EOF_COLUMN) if '\0' in delim else 0)
+    return delims
+
+def _char_classes(keyword_delims):
+    # Columns every DFA state treats alike (same next state and accept mask
+    # everywhere) and that agree on whitespace and on each keyword's
+    # delimiters can share one scan column. Returns the class of every DFA
+    # column, padded to 256 entries so it works as a bytes.translate table.
+    classes = {}
+    char_class = []
+    for col in range(COLUMNS):
+        char_class.append(classes.setdefault((
+            tuple(trans_row[col] for trans_row in DFA_TRANS),
+            tuple(accept_row[col] for accept_row in DFA_ACCEPT),
+            col < 128 and chr(col) in WHITESPACE,
+            tuple((mask >> col) & 1 for mask in keyword_delims.values()),
+        ), len(classes)))
+    char_class += [char_class[NON_ASCII]] * (256 - COLUMNS)
+    return bytes(char_class), len(classes)
+
+# CHAR_CLASS[col]: the scan column of DFA column `col`. Every letter, every
+# digit, etc. behaves the same in every state, so the scan tables only need
+# one column per class (ROW_WIDTH of them) instead of one per char.
+_KEYWORD_DELIM_COLUMNS = _keyword_delims()
+CHAR_CLASS, ROW_WIDTH = _char_classes(_KEYWORD_DELIM_COLUMNS)
+EOF_CLASS = CHAR_CLASS[EOF_COLUMN]
+
+def _class_representatives():
+    representatives = {}
+    for col in range(COLUMNS):
+        representatives.setdefault(CHAR_CLASS[col], col)
+    return [representatives[c] for c in range(ROW_WIDTH)]
+
+# One DFA column standing in for each class.
+CLASS_COLUMNS = _class_representatives()
+
+# Flat, row-major copies of the tables for the scan loop, indexed by class.
+# There a DFA state is its row offset (id * ROW_WIDTH), so a step is the
+# single index SCAN_TRANS[row + col] and the next state comes back already
+# multiplied. DEAD stays -1.
+SCAN_TRANS = [
+    DEAD if row[col] == DEAD else row[col] * ROW_WIDTH
+    for row in DFA_TRANS for col in CLASS_COLUMNS
+]
+SCAN_ACCEPT = [row[col] for row in DFA_ACCEPT for col in CLASS_COLUMNS]
+
+# Keyword -> bitmask over scan columns of the chars that may follow it. A
+# word is a keyword when the column after it is in its mask, and a forced
+# identifier otherwise.
+KEYWORD_DELIMS = {
+    word: sum(1 << c for c, col in enumerate(CLASS_COLUMNS) if (mask >> col) & 1)
+    for word, mask in _KEYWORD_DELIM_COLUMNS.items()
+}
+
+# The regex fast path's word/number entry points as row offsets.
+IDENT_ROWS = {n: DFA_IDS[s] * ROW_WIDTH for n, s in IDENT_STATES.items()}
+NUMBER_ROWS = {key: DFA_IDS[s] * ROW_WIDTH for key, s in NUMBER_STATES.items() if s}
+# A closed string literal always ends in the same state (just past the
+# closing quote), a line comment with any body in the same body state and a
+# closed block comment in the same state after its final '*\'.
+STRING_ROW = DFA_IDS[walk('""')] * ROW_WIDTH
+LINE_COMMENT_ROW = DFA_IDS[walk('\\\\ ')] * ROW_WIDTH
+BLOCK_COMMENT_ROW = DFA_IDS[walk('\\* *\\')] * ROW_WIDTH
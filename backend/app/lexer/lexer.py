@@ -1,118 +1,250 @@
-import sys
-from .td import STATES, ID_END_STATES 
-from .token import tokenize        
+import re
+from .td import ID_END_MASK, mask_states
+from .dfa import (
+    DFA_START, DFA_STATES, DFA_TRANS, DFA_ACCEPT, DFA_UNCLOSED_COMMENT,
+    SCAN_TRANS, SCAN_ACCEPT, KEYWORD_DELIMS, IDENT_ROWS, NUMBER_ROWS,
+    STRING_ROW, LINE_COMMENT_ROW, BLOCK_COMMENT_ROW, ROW_WIDTH, CHAR_CLASS,
+    CLASS_COLUMNS, WHITESPACE, NON_ASCII, EOF_COLUMN, EOF_CLASS, DEAD,
+)
+from .token import tokenize, RESERVED_WORDS
 from . import lexer_errors        
 
+__all__ = ['Lexer', 'TokenMetadata']
+
+# A run of ignorable whitespace (same chars as Lexer.WHITESPACE).
+_WS_RE = re.compile(r'[ \t\r\n]+')
+
+# Fast path for the token classes that make up most source: words
+# (identifiers and keywords, states 262-301), unsigned numbers
+# (states 215-261), closed string literals (states 308-313), line
+# comments (states 314-317) and closed block comments (states 318-322). The
+# length limits mirror the FA's chains and the char classes mirror REGDEF's
+# ascii_298_302 / ascii_no_newline / ascii_309. Their bodies are the long
+# runs, and here re skips them in C instead of one DFA step per char.
+_TOKEN_RE = re.compile(
+    r'(?P<word>[a-z_][A-Za-z0-9]{0,19})'
+    r'|(?P<number>(?P<int>[0-9]{1,15})(?:\.(?P<frac>[0-9]{1,8}))?)'
+    r'|(?P<string>"(?:[^\x00\n"\'\\\x80-\U0010ffff]|\\[\x00-\x7f])*")'
+    r'|(?P<comment>\\\\[^\x00\n\x80-\U0010ffff]+)'
+    r'|(?P<block_comment>\\\*[^*\x00\x80-\U0010ffff]+\*+\\)'
+)
+
+# Every non-ASCII char, for scan_columns.
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+def scan_columns(src: str) -> bytes:
+    """
+    The source as scan columns (char classes, see dfa.CHAR_CLASS), one byte
+    per char so offsets line up with the str, plus one extra EOF_CLASS byte
+    to mark the end. With that sentinel in place the scan never needs a
+    bounds check, and since EOF has a class of its own a NUL in the source
+    stays an ordinary char.
+    """
+    if not src.isascii():
+        src = _NON_ASCII_RE.sub(chr(NON_ASCII), src)
+    return (src.encode('latin-1') + bytes((EOF_COLUMN,))).translate(CHAR_CLASS)
+
+# First-char dispatch for tokenize_all, indexed by scan column: whitespace
+# goes to the whitespace skipper, single-char tokens (no DFA state continues
+# past them, e.g. ',' or ')') only need the delimiter after them checked,
+# and everything else runs the full scan.
+DISPATCH_SCAN = 0
+DISPATCH_WHITESPACE = 1
+DISPATCH_SINGLE_CHAR = 2
+
+def _dispatch_kind(col):
+    if col < 128 and chr(col) in WHITESPACE:
+        return DISPATCH_WHITESPACE
+    state = DFA_TRANS[DFA_START][col]
+    if state != DEAD and all(next_state == DEAD for next_state in DFA_TRANS[state]):
+        return DISPATCH_SINGLE_CHAR
+    return DISPATCH_SCAN
+
+DISPATCH = [_dispatch_kind(col) for col in CLASS_COLUMNS]
+
+def _body_skips():
+    # DFA states that loop back to themselves on a set of chars without
+    # accepting anything (string and comment bodies): a run of those chars
+    # changes nothing, so the scan can jump over it with one regex match.
+    # Keyed by row offset.
+    skips = {}
+    for state, (trans_row, accept_row) in enumerate(zip(DFA_TRANS, DFA_ACCEPT)):
+        loop_cols = [col for col in range(EOF_COLUMN)
+                     if trans_row[col] == state and not accept_row[col]]
+        if not loop_cols:
+            continue
+        chars = ''.join(re.escape(chr(col)) for col in loop_cols if col < 128)
+        if NON_ASCII in loop_cols:
+            chars += '\x80-\U0010ffff'
+        skips[state * ROW_WIDTH] = re.compile(f'[{chars}]*').match
+    return skips
+
+_BODY_SKIPS = _body_skips()
+
+def _simulate(src: str, cols: bytes, start_index: int):
+    """
+    The FA core: runs one longest-match scan of `src` from `start_index`
+    over the precomputed DFA (see dfa.py), one table lookup per char, and
+    leaves all token and error decisions to the caller. `cols` is
+    `scan_columns(src)`.
+
+    Returns (search_index, last_accepted_end_index, last_accepted_states,
+    last_good_active_states, char_that_killed_it). State sets are NFA
+    bitmasks and last_accepted_end_index is None if nothing was accepted.
+    lexer_errors expects EOF as '\0', so that's what char_that_killed_it
+    is at the end of the source.
+    """
+    trans = SCAN_TRANS
+    accept = SCAN_ACCEPT
+    body_skips = _BODY_SKIPS
+
+    # Words, numbers, strings and line comments: one regex match, then a
+    # single DFA step on the char after it from the state the whole match
+    # leads to. The FA can't run past the match, so if that step accepts,
+    # it's the longest token. Otherwise fall back to the full scan below,
+    # which also produces the right error.
+    match = _TOKEN_RE.match(src, start_index)
+    if match is not None:
+        end_index = match.end()
+        kind = match.lastgroup
+        if kind == 'word':
+            row = IDENT_ROWS[end_index - start_index]
+        elif kind == 'number':
+            frac = match.group('frac')
+            row = NUMBER_ROWS[len(match.group('int')), len(frac) if frac else 0]
+        elif kind == 'string':
+            row = STRING_ROW
+        elif kind == 'comment':
+            row = LINE_COMMENT_ROW
+        else:
+            row = BLOCK_COMMENT_ROW
+        col = cols[end_index]
+        accepted = accept[row + col]
+        # A closing '*\' followed by '\' may still run on into a line
+        # comment, so a block comment also needs the FA to stop there.
+        if accepted and (kind != 'block_comment' or trans[row + col] == DEAD):
+            return (end_index, end_index, accepted, DFA_STATES[row // ROW_WIDTH],
+                    src[end_index:end_index + 1] or '\0')
+
+    row = DFA_START
+    search_index = start_index
+    last_accepted_end_index = None
+    last_accepted_states = 0
+
+    while True:
+        col = cols[search_index]
+
+        # Every step is one char longer than the last, so a hit here is
+        # always the new longest match.
+        accepted = accept[row + col]
+        if accepted:
+            last_accepted_end_index = search_index
+            last_accepted_states = accepted
+
+        # The EOF column never moves on, so the sentinel always ends the loop.
+        next_row = trans[row + col]
+        if next_row < 0:
+            break
+        if next_row == row:
+            skip = body_skips.get(row)
+            if skip is not None:
+                search_index = skip(src, search_index + 1).end()
+                continue
+        row = next_row
+        search_index += 1
+
+    if col == EOF_CLASS and DFA_UNCLOSED_COMMENT[row // ROW_WIDTH]:
+        last_accepted_end_index = search_index
+        last_accepted_states = 1 << 317
+
+    return (search_index, last_accepted_end_index, last_accepted_states,
+            DFA_STATES[row // ROW_WIDTH], src[search_index:search_index + 1] or '\0')
+
+class TokenMetadata:
+    """
+    Per-token metadata kept as parallel columns (line, col, start, end,
+    force_id). Indexing builds the dict that tokenize() and the API expect.
+    """
+    __slots__ = ('line', 'col', 'start', 'end', 'force_id')
+
+    def __init__(self):
+        self.line = []
+        self.col = []
+        self.start = []
+        self.end = []
+        self.force_id = []
+
+    def __len__(self):
+        return len(self.start)
+
+    def __getitem__(self, i):
+        return {
+            'line': self.line[i],
+            'col': self.col[i],
+            'start': self.start[i],
+            'end': self.end[i],
+            'force_id': self.force_id[i]
+        }
+
 class Lexer:
-    WHITESPACE = {' ', '\n', '\t', '\r'}
+    WHITESPACE = frozenset({' ', '\n', '\t', '\r'})
     
     def __init__(self, source_code: str):
         self.source_code = source_code
+        self.scan_columns = scan_columns(source_code)
         self.cursor = 0
         self.line = 1
         self.col = 1
 
-    def _get_char_at(self, index: int) -> str:
-        if index < len(self.source_code): 
-            return self.source_code[index]
-        return '\0' # EOF marker
-
-    def _check_char_in_state_chars(self, char: str, state_chars) -> bool:
-        try: 
-            return char in state_chars
-        except: 
-            return False
-
+    def _advance_position(self, text: str):
+        # Moves the cursor past `text`, which must start at the cursor, and
+        # updates line/col in bulk: a newline resets col to 1 and a tab
+        # counts as 4 cols.
+        newlines = text.count('\n')
+        if newlines:
+            tail = text[text.rfind('\n') + 1:]
+            self.line += newlines
+            self.col = 1 + len(tail) + 3 * tail.count('\t')
+        else:
+            self.col += len(text) + 3 * text.count('\t')
+        self.cursor += len(text)
 
     def _skip_ignorable_whitespace(self):
-        while self.cursor < len(self.source_code):
-            char = self.source_code[self.cursor]
-            if char in self.WHITESPACE:
-                if char == '\n': 
-                    self.line += 1
-                    self.col = 1
-                elif char == '\t':
-                    self.col += 4
-                else: 
-                    self.col += 1
-                self.cursor += 1
-            else: 
-                break
+        # One C-level regex scan over the whole whitespace run.
+        match = _WS_RE.match(self.source_code, self.cursor)
+        if match is not None:
+            self._advance_position(match.group())
     
     def _get_next_token(self):
-        active_states = {0}
-        current_lexeme = ""
-        search_index = self.cursor
-        last_accepted_lexeme = None
-        last_accepted_end_index = self.cursor
-        last_good_active_states = {0}
-        char_that_killed_it = '\0' 
-        last_accepted_states = set()
-        
-        while active_states:
-            last_good_active_states = active_states
-            lookahead_char = self._get_char_at(search_index)
-            char_that_killed_it = lookahead_char
-            
-            next_active_states = set()
-
-            # --- Delimiter Check ---
-            for state_id in active_states:
-                for next_state_id in STATES[state_id].branches:
-                    next_state = STATES[next_state_id]
-                    if next_state.isEnd and self._check_char_in_state_chars(lookahead_char, next_state.chars):
-                        if last_accepted_lexeme is None or len(current_lexeme) > len(last_accepted_lexeme):
-                            last_accepted_lexeme = current_lexeme
-                            last_accepted_end_index = search_index
-                            last_accepted_states = {next_state_id} 
-                        elif len(current_lexeme) == len(last_accepted_lexeme):
-                            last_accepted_states.add(next_state_id) 
-            
-            if lookahead_char == '\0':
-                if not active_states.isdisjoint(lexer_errors.UNCLOSED_COMMENT_STATES):
-                    last_accepted_lexeme = current_lexeme
-                    last_accepted_end_index = search_index
-                    last_accepted_states = {317} 
-                break
-            
-            # --- State Transition ---
-            for state_id in active_states:
-                for next_state_id in STATES[state_id].branches:
-                    next_state = STATES[next_state_id]
-                    if not next_state.isEnd and self._check_char_in_state_chars(lookahead_char, next_state.chars):
-                        next_active_states.add(next_state_id)
-            
-            if not next_active_states: 
-                break
-                
-            active_states = next_active_states
-            current_lexeme += lookahead_char
-            search_index += 1
-        
-        start_meta = (self.line, self.col, self.cursor, last_accepted_end_index)
+        start_index = self.cursor
+        src = self.source_code
+        (search_index, last_accepted_end_index, last_accepted_states,
+         last_good_active_states, char_that_killed_it) = _simulate(src, self.scan_columns, start_index)
+
+        # The lexeme is always a slice of the source starting at the cursor,
+        # so the scan only tracks indices and the strings are cut here.
+        current_lexeme = src[start_index:search_index]
+        start_meta = (self.line, self.col, start_index,
+                      start_index if last_accepted_end_index is None else last_accepted_end_index)
 
         # Dead End Check (e.g. "123." or "sky')
-        if last_accepted_lexeme is not None and len(current_lexeme) > len(last_accepted_lexeme):
-            error = lexer_errors.check_for_dead_end_error(last_good_active_states, current_lexeme, start_meta)
-            if error: 
-                return None, error, None 
-        
-        # Check for dead end even if NO token was accepted
-        if last_accepted_lexeme is None and len(current_lexeme) > 0:
-             error = lexer_errors.check_for_dead_end_error(last_good_active_states, current_lexeme, start_meta)
-             if error:
-                 return None, error, None
+        # Runs whether or not a shorter token was accepted along the way.
+        if last_accepted_end_index is None or search_index > last_accepted_end_index:
+            if search_index > start_index:
+                error = lexer_errors.check_for_dead_end_error(mask_states(last_good_active_states), current_lexeme, start_meta)
+                if error: 
+                    return None, error, None 
 
         # Success
-        if last_accepted_lexeme is not None:
-            lexeme = last_accepted_lexeme
-            new_cursor_pos = last_accepted_end_index
-            return lexeme, new_cursor_pos, last_accepted_states
+        if last_accepted_end_index is not None:
+            lexeme = src[start_index:last_accepted_end_index]
+            return lexeme, last_accepted_end_index, last_accepted_states
         
         # Total Failure
-        failed_char = self._get_char_at(self.cursor)
+        # tokenize_all only calls in with the cursor on a real char.
+        failed_char = src[start_index]
         error = lexer_errors.check_for_total_failure_error(
-            last_good_active_states,
+            mask_states(last_good_active_states),
             char_that_killed_it,
             current_lexeme,
             start_meta,
@@ -122,18 +254,34 @@ class Lexer:
 
     def tokenize_all(self):
         lexemes = []  
-        metadata = [] 
+        metadata = TokenMetadata()
+        meta_line, meta_col = metadata.line.append, metadata.col.append
+        meta_start, meta_end = metadata.start.append, metadata.end.append
+        meta_force_id = metadata.force_id.append
         errors = []   
         
-        while self.cursor < len(self.source_code):
-            self._skip_ignorable_whitespace()
-            if self.cursor >= len(self.source_code): 
-                break 
+        src = self.source_code
+        cols = self.scan_columns
+        src_len = len(src)
+        dispatch = DISPATCH
+        
+        while self.cursor < src_len:
+            col = cols[self.cursor]
+            kind = dispatch[col]
+            if kind == DISPATCH_WHITESPACE:
+                self._skip_ignorable_whitespace()
+                continue
                 
             start_cursor = self.cursor
             start_line, start_col = self.line, self.col
             
-            lexeme, result, accepted_states = self._get_next_token()
+            accepted_states = 0
+            if kind == DISPATCH_SINGLE_CHAR:
+                accepted_states = SCAN_ACCEPT[SCAN_TRANS[col] + cols[start_cursor + 1]]
+            if accepted_states:
+                lexeme, result = src[start_cursor], start_cursor + 1
+            else:
+                lexeme, result, accepted_states = self._get_next_token()
             
             if lexeme is None:
                 error_tuple = result 
@@ -160,55 +308,39 @@ class Lexer:
                 # Cursor Adjustment
                 if error_tuple[0] in ['INVALID_DELIMITER', 'UNFINISHED_FLUX', 'UNCLOSED_STRING', 'UNCLOSED_CHAR']:
                     text_to_skip = error_tuple[2][0] if error_tuple[0] == 'INVALID_DELIMITER' else error_tuple[2]
-                    
-                    for char in text_to_skip:
-                        if char == '\n':
-                            self.line += 1
-                            self.col = 1
-                        elif char == '\t':
-                            self.col += 4
-                        else:
-                            self.col += 1
-                    self.cursor += len(text_to_skip)
+                    self._advance_position(text_to_skip)
                 else:
                     # Standard panic (1 char)
-                    char_at_cursor = self._get_char_at(self.cursor)
-                    if char_at_cursor == '\n':
-                        self.line += 1
-                        self.col = 1
-                    elif char_at_cursor == '\t':
-                        self.col += 4
-                    else:
-                        self.col += 1
-                    self.cursor += 1 
+                    self._advance_position(src[self.cursor])
                 
                 continue 
             
             end_cursor = result
             
-            is_forced_id = False
-            if accepted_states and accepted_states.issubset(ID_END_STATES):
-                is_forced_id = True
-
-            lexemes.append(lexeme)
-            metadata.append({
-                'line': start_line, 
-                'col': start_col, 
-                'start': start_cursor, 
-                'end': end_cursor,
-                'force_id': is_forced_id
-            })
-            
-            self.cursor = end_cursor
+            # accepted_states is a bitmask; forced to an identifier when every
+            # accepting state is an identifier end state, unless the word is a
+            # keyword followed by one of its own delimiters.
+            is_forced_id = bool(accepted_states) and (accepted_states | ID_END_MASK) == ID_END_MASK
+            if is_forced_id:
+                keyword_delims = KEYWORD_DELIMS.get(lexeme)
+                if keyword_delims is not None and (keyword_delims >> cols[result]) & 1:
+                    is_forced_id = False
+
+            # Words are settled here, where force_id is already known, and
+            # handed to tokenize() pre-tagged so it skips its cascade for them.
+            if is_forced_id:
+                lexemes.append((lexeme, 'identifier'))
+            elif lexeme in RESERVED_WORDS:
+                lexemes.append((lexeme, lexeme))
+            else:
+                lexemes.append(lexeme)
+            meta_line(start_line)
+            meta_col(start_col)
+            meta_start(start_cursor)
+            meta_end(end_cursor)
+            meta_force_id(is_forced_id)
             
-            for char in lexeme:
-                if char == '\n': 
-                    self.line += 1
-                    self.col = 1
-                elif char == '\t':
-                    self.col += 4
-                else: 
-                    self.col += 1
+            self._advance_position(lexeme)
 
         tokens = tokenize(lexemes, metadata)
         return tokens, errors
\ No newline at end of file
@@ -1,20 +1,20 @@
 #
 # lexer_errors.py
 #
-import sys
-from .td import STATES 
+from .td import STATES_LIST, states_mask
 
-# State 240 is the state right after seeing a '.', (e.g., "123.")
-UNFINISHED_FLUX_STATES = {245}
+# State 245 is the state right after seeing a '.', (e.g., "123.")
+UNFINISHED_FLUX_STATES = frozenset({245})
 
-# States 304/308 are inside a string literal.
-UNCLOSED_STRING_STATES = {309, 313}
+# States 309/313 are inside a string literal.
+UNCLOSED_STRING_STATES = frozenset({309, 313})
 
-# States 298/302 are inside a char literal.
-UNCLOSED_CHAR_STATES = {303, 305}
+# States 303/305 are inside a char literal.
+UNCLOSED_CHAR_STATES = frozenset({303, 305})
 
-# States 314/315 are inside a multi-line comment.
-UNCLOSED_COMMENT_STATES = {319, 320, 321}
+# States 319/320/321 are inside a multi-line comment.
+UNCLOSED_COMMENT_STATES = frozenset({319, 320, 321})
+UNCLOSED_COMMENT_MASK = states_mask(UNCLOSED_COMMENT_STATES)
 
 
 def check_for_dead_end_error(last_good_active_states, current_lexeme, start_metadata):
@@ -57,19 +57,13 @@ def check_for_total_failure_error(
     if char_that_killed_it != '\0' and last_good_active_states:
         potential_end_state_reachable = False
         for state_id in last_good_active_states:
-            if state_id not in STATES: continue
-            
-            if STATES[state_id].isEnd:
+            # end_branches is pre-bucketed in td.py, so there's no need to
+            # re-scan every branch for an end state.
+            state = STATES_LIST[state_id]
+            if state.isEnd or state.end_branches:
                 potential_end_state_reachable = True
                 break
 
-            for branch_id in STATES[state_id].branches:
-                if branch_id in STATES and STATES[branch_id].isEnd:
-                    potential_end_state_reachable = True
-                    break
-            if potential_end_state_reachable:
-                break
-
         if potential_end_state_reachable:
             return ('INVALID_DELIMITER', (line, col), (current_lexeme, char_that_killed_it))
 
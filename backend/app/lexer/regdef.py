@@ -7,6 +7,12 @@
 # This keeps the definitions consistent and easy to modify.
 #
 
+_ASCII = frozenset(map(chr, range(128)))
+
+def _ascii_except(excluded: str) -> frozenset:
+    # All 128 ASCII chars minus `excluded`, as one set difference.
+    return _ASCII - frozenset(excluded)
+
 REGDEF = {
     # --- Special ASCII Sets ---
     # These are used for specific, tricky states in the FA,
@@ -14,22 +20,22 @@ REGDEF = {
     # are allowed, but a few (like '\n' or '"') are special.
 
     # All ASCII characters
-    'ascii': {chr(i) for i in range(128)},
+    'ascii': _ASCII,
     
     # ASCII excluding newline and null
-    'ascii_no_newline': {chr(i) for i in range(128) if chr(i) not in ['\n', '\0']},
+    'ascii_no_newline': _ascii_except('\n\0'),
     
     # ASCII for char/string literals: excludes quotes, newline, and backslash
-    'ascii_298_302': {chr(i) for i in range(128) if chr(i) not in ['\'', '"', '\n', '\\', '\0']},
+    'ascii_298_302': _ascii_except('\'"\n\\\0'),
     
     # ASCII for multi-line comments: excludes '*' and null
-    'ascii_309': {chr(i) for i in range(128) if chr(i) not in ['*', '\0']},
+    'ascii_309': _ascii_except('*\0'),
 
     # NEW: ASCII for resolving comment ambiguity.
     # Used when we've just seen a '*'. We accept anything EXCEPT:
     # 1. '*' (which would keep us in the 'potential end' state)
     # 2. '\' (which MUST close the comment)
-    'ascii_safe_comment_body': {chr(i) for i in range(128) if chr(i) not in ['*', '\\', '\0']},
+    'ascii_safe_comment_body': _ascii_except('*\\\0'),
 
     # --- Basic Character Sets ---
     'alphabet': {
@@ -63,4 +69,7 @@ REGDEF = {
     # 'io_delim' is specific to my I/O keywords (lumen, lumina, nova)
     # which must be followed by a '(' or a comment start '\\'.
     'io_delim': {'(', '\\'}
-}
\ No newline at end of file
+}
+
+# Freeze the rest too; like DELIMS, these are only ever read.
+REGDEF = {name: frozenset(chars) for name, chars in REGDEF.items()}
\ No newline at end of file
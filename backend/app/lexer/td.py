@@ -1,376 +1,199 @@
 from .regdef import REGDEF
 from .delims import DELIMS
 
+def ascii_mask(chars) -> int:
+    """
+    Packs the ASCII part of a char set into a 128-bit int (bit i set when
+    chr(i) is in the set), so membership is `(mask >> ord(c)) & 1` instead
+    of hashing `c` into the set.
+    """
+    mask = 0
+    for c in chars:
+        if len(c) == 1 and ord(c) < 128:
+            mask |= 1 << ord(c)
+    return mask
+
+# Interned char classes -> their ASCII mask. States with equal char sets
+# share one frozenset and one mask instead of each building their own.
+_CHAR_MASKS = {}
+
 class State:
-    def __init__(self, chars: list[str], branches: list[int] = [], end = False):
-        self.chars = [chars] if type(chars) is str else chars
+    # A few hundred of these live for the whole process; slots keep each one
+    # to its fields. The last four are filled in once STATES is complete.
+    __slots__ = (
+        'chars', 'char_mask', 'branches', 'isEnd',
+        'end_branches', 'nonend_branches', 'end_masks', 'nonend_masks',
+    )
+
+    def __init__(self, chars: list[str], branches: list[int] | None = None, end = False):
+        chars = frozenset([chars] if type(chars) is str else chars)
+        if chars not in _CHAR_MASKS:
+            _CHAR_MASKS[chars] = (chars, ascii_mask(chars))
+        self.chars, self.char_mask = _CHAR_MASKS[chars]
+        # End states have no branches; give each state its own list rather
+        # than sharing one default.
+        if branches is None:
+            branches = []
         self.branches = [branches] if type(branches) is int else branches
         self.isEnd = end
 
-STATES = {
-    0: State('initial', [
-        1, 10, 16, 20, 25, 32, 42, 46, 73, 77, 84, 91, 97, 119, 124, 134, 
-        143, 149, 155, 159, 165, 167, 171, 175, 179, 184, 188, 191, 194, 
-        197, 199, 201, 203, 205, 207, 209, 211, 213, 215, 262, 302, 308, 
-        314, 323
-    ]),
-    
-    1: State('a', [2]),
-    2: State('n', [3]),
-    3: State('d', [4]),
-    4: State(DELIMS['separator_delim'], end=True),
-    
-    10: State('b', [11]), 
-    11: State('l', [12]), 
-    12: State('a', [13]), 
-    13: State('z', [14]), 
-    14: State('e', [15]), 
-    15: State(REGDEF['free_delim'], end=True), 
+    def matches(self, char: str) -> bool:
+        """Whether `char` is in this state's char class."""
+        code = ord(char)
+        if code < 128:
+            return bool((self.char_mask >> code) & 1)
+        # The mask only covers ASCII; anything wider goes to the set.
+        return char in self.chars
 
-    16: State('c', [17]), 
-    17: State('o', [18]), 
-    18: State('s', [19]), 
-    19: State(REGDEF['free_delim'], end=True), 
+def _masks_by_char(branches) -> tuple[int, ...]:
+    # For each ASCII code, the OR of the `branches` (id, char_mask) whose
+    # mask holds it. Walks the set bits of each mask rather than testing
+    # all 128 codes per branch.
+    masks = [0] * 128
+    for state_id, char_mask in branches:
+        bit = 1 << state_id
+        while char_mask:
+            low = char_mask & -char_mask
+            masks[low.bit_length() - 1] |= bit
+            char_mask ^= low
+    return tuple(masks)
 
-    20: State('f', [21]), 
-    21: State('l', [22]), 
-    22: State('u', [23]), 
-    23: State('x', [24]), 
-    24: State(REGDEF['free_delim'], end=True), 
+def _counted_chain(first_id: int, length: int, chars, delim, tail=()) -> dict[int, State]:
+    """
+    Builds the states for a token part capped at `length` chars of `chars`:
+    state `first_id + 2k` reads char k+1 and `first_id + 2k + 1` accepts
+    there if the lookahead is in `delim`. Every read state may also move on
+    to the `tail` states (e.g. the '.' of a flux literal). The cap is part of
+    the language, so the chain is unrolled rather than a self-loop.
+    """
+    states = {}
+    for k in range(length):
+        read_id = first_id + 2 * k
+        branches = [read_id + 1]
+        if k < length - 1:
+            branches.append(read_id + 2)
+        states[read_id] = State(chars, branches + list(tail))
+        states[read_id + 1] = State(delim, end=True)
+    return states
 
-    25: State('h', [26]), 
-    26: State('u', [27]), 
-    27: State('b', [28]), 
-    28: State('b', [29]), 
-    29: State('l', [30]), 
-    30: State('e', [31]), 
-    31: State(REGDEF['free_delim'], end=True), 
+def _operator_states(first_id: int, op: str, delim, doubles=(), tail=()) -> dict[int, State]:
+    """
+    Builds the states for the symbol `op` from `first_id` on: `op` accepts
+    on its own if the lookahead is in `delim` (None if it never stands
+    alone), and each (char, delim) in `doubles` is a two-char form `op +
+    char` with its own delimiters. `op` may also move on to the `tail`
+    states.
+    """
+    states = {}
+    branches = []
+    next_id = first_id + 1
+    if delim is not None:
+        states[next_id] = State(delim, end=True)
+        branches.append(next_id)
+        next_id += 1
+    for char, double_delim in doubles:
+        states[next_id] = State(char, [next_id + 1])
+        states[next_id + 1] = State(double_delim, end=True)
+        branches.append(next_id)
+        next_id += 2
+    states[first_id] = State(op, branches + list(tail))
+    return states
 
-    32: State('i', [33, 37]), 
-    
-    33: State('r', [34]), 
-    34: State('i', [35]), 
-    35: State('s', [36]), 
-    36: State(DELIMS['iris_sage_delim'], end=True), 
-    
-    37: State('x', [38]), 
-    38: State('i', [39]), 
-    39: State('o', [40]), 
-    40: State('n', [41]), 
-    41: State(REGDEF['free_delim'], end=True), 
-    
-    42: State('k', [43]), 
-    43: State('a', [44]), 
-    44: State('i', [45]), 
-    45: State(REGDEF['free_delim'], end=True), 
-
-    46: State('l', [47, 51, 56, 61]), 
-    
-    47: State('a', [48]), 
-    48: State('n', [49]), 
-    49: State('i', [50]), 
-    50: State(REGDEF['free_delim'], end=True), 
-    
-    51: State('e', [52, 54]), 
-    52: State('o', [53]), 
-    53: State(REGDEF['free_delim'], end=True), 
-    54: State('t', [55]), 
-    55: State(REGDEF['free_delim'], end=True), 
+# First chars of an identifier and of a '::label::' name; the rest of
+# either is plain REGDEF['alphanumeric'].
+_IDENT_START = frozenset({*REGDEF['alphabet'], '_'})
+_LABEL_START = frozenset({*REGDEF['alphanumeric'], '_'})
 
-    56: State('o', [57]), 
-    57: State('c', [58]), 
-    58: State('a', [59]), 
-    59: State('l', [60]), 
-    60: State(REGDEF['free_delim'], end=True), 
+# Reserved words and the delimiters each may be followed by. They have no
+# FA states of their own: a keyword scans as an identifier, and the lexer
+# looks the word up here to tell the two apart (see dfa.KEYWORD_DELIMS).
+KEYWORDS = [
+    ('and', DELIMS['separator_delim']),
+    ('blaze', REGDEF['free_delim']),
+    ('cos', REGDEF['free_delim']),
+    ('flux', REGDEF['free_delim']),
+    ('hubble', REGDEF['free_delim']),
+    ('iris', DELIMS['iris_sage_delim']),
+    ('ixion', REGDEF['free_delim']),
+    ('kai', REGDEF['free_delim']),
+    ('lani', REGDEF['free_delim']),
+    ('leo', REGDEF['free_delim']),
+    ('let', REGDEF['free_delim']),
+    ('local', REGDEF['free_delim']),
+    ('lumen', REGDEF['io_delim']),
+    ('lumina', REGDEF['io_delim']),
+    ('luna', REGDEF['free_delim']),
+    ('mos', DELIMS['mos_delim']),
+    ('not', DELIMS['separator_delim']),
+    ('nova', REGDEF['io_delim']),
+    ('or', DELIMS['separator_delim']),
+    ('orbit', REGDEF['free_delim']),
+    ('phase', REGDEF['free_delim']),
+    ('sage', DELIMS['iris_sage_delim']),
+    ('selene', REGDEF['free_delim']),
+    ('sol', DELIMS['separator_delim']),
+    ('soluna', DELIMS['separator_delim']),
+    ('star', REGDEF['free_delim']),
+    ('void', REGDEF['free_delim']),
+    ('wane', {*DELIMS['separator_delim'], '}', ';'}),
+    ('warp', DELIMS['warp_delim']),
+    ('wax', REGDEF['free_delim']),
+    ('zara', DELIMS['zara_delim']),
+    ('zeru', DELIMS['zeru_delim']),
+    ('zeta', REGDEF['free_delim']),
+]
 
-    61: State('u', [62, 70]), 
-    62: State('m', [63, 66]), 
-    
-    63: State('e', [64]), 
-    64: State('n', [65]), 
-    65: State(REGDEF['io_delim'], end=True), 
-    
-    66: State('i', [67]), 
-    67: State('n', [68]), 
-    68: State('a', [69]), 
-    69: State(REGDEF['io_delim'], end=True), 
-    
-    70: State('n', [71]), 
-    71: State('a', [72]), 
-    72: State(REGDEF['free_delim'], end=True), 
-
-    73: State('m', [74]), 
-    74: State('o', [75]), 
-    75: State('s', [76]), 
-    76: State(DELIMS['mos_delim'], end=True), 
-    
-    77: State('n', [78]), 
-    78: State('o', [79, 81]), 
-    
-    79: State('t', [80]), 
-    80: State(DELIMS['separator_delim'], end=True), 
-    
-    81: State('v', [82]), 
-    82: State('a', [83]), 
-    83: State(REGDEF['io_delim'], end=True), 
-    
-    84: State('o', [85]), 
-    85: State('r', [86, 87]), 
-    86: State(DELIMS['separator_delim'], end=True),   
-    
-    87: State('b', [88]), 
-    88: State('i', [89]), 
-    89: State('t', [90]), 
-    90: State(REGDEF['free_delim'], end=True),            
-    
-    91: State('p', [92]), 
-    92: State('h', [93]), 
-    93: State('a', [94]), 
-    94: State('s', [95]), 
-    95: State('e', [96]), 
-    96: State(REGDEF['free_delim'], end=True),  
-    
-    97: State('s', [98, 102, 108, 115]),  
-    
-    98: State('a', [99]), 
-    99: State('g', [100]), 
-    100: State('e', [101]), 
-    101: State(DELIMS['iris_sage_delim'], end=True), 
-    
-    102: State('e', [103]), 
-    103: State('l', [104]), 
-    104: State('e', [105]), 
-    105: State('n', [106]), 
-    106: State('e', [107]), 
-    107: State(REGDEF['free_delim'], end=True), 
-    
-    108: State('o', [109]), 
-    109: State('l', [110, 111]), 
-    110: State(DELIMS['separator_delim'], end=True), 
-    
-    111: State('u', [112]), 
-    112: State('n', [113]), 
-    113: State('a', [114]), 
-    114: State(DELIMS['separator_delim'], end=True), 
-    
-    115: State('t', [116]), 
-    116: State('a', [117]), 
-    117: State('r', [118]), 
-    118: State(REGDEF['free_delim'], end=True), 
-    
-    119: State('v', [120]), 
-    120: State('o', [121]), 
-    121: State('i', [122]), 
-    122: State('d', [123]), 
-    123: State(REGDEF['free_delim'], end=True),  
-    
-    124: State('w', [125]), 
-    125: State('a', [126, 129, 132]), 
-    
-    126: State('n', [127]), 
-    127: State('e', [128]), 
-    128: State({*DELIMS['separator_delim'], '}', ';'}, end=True),  
-    
-    129: State('r', [130]), 
-    130: State('p', [131]), 
-    131: State(DELIMS['warp_delim'], end=True),  
-    
-    132: State('x', [133]), 
-    133: State(REGDEF['free_delim'], end=True), 
-    
-    134: State('z', [135, 139]), 
-    
-    135: State('a', [136]), 
-    136: State('r', [137]), 
-    137: State('a', [138]), 
-    138: State(DELIMS['zara_delim'], end=True),  
-    
-    139: State('e', [140, 333]), 
-    
-    140: State('r', [141]), 
-    141: State('u', [142]), 
-    142: State(DELIMS['zeru_delim'], end=True),
-            
-    143: State('+', [144, 145, 147]), 
-    144: State(DELIMS['arithmetic_delim'], end=True), 
-    145: State('+', [146]), 
-    146: State(DELIMS['unary_delim'], end=True), 
-    147: State('=', [148]), 
-    148: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    149: State('-', [150, 151, 153, 215]), 
-    150: State(DELIMS['minus_delim'], end=True), 
-    151: State('-', [152]), 
-    152: State(DELIMS['unary_delim'], end=True), 
-    153: State('=', [154]), 
-    154: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    155: State('*', [156, 157]), 
-    156: State(DELIMS['arithmetic_delim'], end=True), 
-    157: State('=', [158]), 
-    158: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    159: State('/', [160, 161, 163]), 
-    160: State(DELIMS['arithmetic_delim'], end=True), 
-    161: State('=', [162]), 
-    162: State(DELIMS['most_symbol_delim'], end=True), 
-    163: State('/', [164]), 
-    164: State(DELIMS['arithmetic_delim'], end=True), 
-    
-    165: State('^', [166]),      
-    166: State(DELIMS['arithmetic_delim'], end=True), 
-    
-    167: State('%', [168, 169]), 
-    168: State(DELIMS['arithmetic_delim'], end=True), 
-    169: State('=', [170]), 
-    170: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    171: State('=', [172, 173]), 
-    172: State(DELIMS['comma_equal_delim'], end=True), 
-    173: State('=', [174]), 
-    174: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    175: State('!', [176, 177]), 
-    176: State(DELIMS['not_delim'], end=True), 
-    177: State('=', [178]), 
-    178: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    179: State('<', [180, 182]), 
-    180: State(DELIMS['most_symbol_delim'], end=True), 
-    182: State('=', [183]), 
-    183: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    184: State('>', [185, 186]), 
-    185: State(DELIMS['most_symbol_delim'], end=True), 
-    186: State('=', [187]), 
-    187: State(DELIMS['most_symbol_delim'], end=True), 
-    
-    188: State('&', [189]), 
-    189: State('&', [190]), 
-    190: State(DELIMS['and_or_delim'], end=True), 
-    
-    191: State('|', [192]), 
-    192: State('|', [193]), 
-    193: State(DELIMS['and_or_delim'], end=True), 
-    
-    194: State('.', [195]), 
-    195: State('.', [196]), 
-    196: State(DELIMS['string_concat_delim'], end=True), 
-    
-    197: State('#', [198]), 
-    198: State(DELIMS['string_length_delim'], end=True), 
-    
-    199: State('(', [200]), 200: State(DELIMS['open_parenthesis_delim'], end=True),
-    201: State(')', [202]), 202: State(DELIMS['close_parenthesis_delim'], end=True),
-    203: State('[', [204]), 204: State(DELIMS['open_square_delim'], end=True),
-    205: State(']', [206]), 206: State(DELIMS['close_square_delim'], end=True),
-    207: State('{', [208]), 208: State(DELIMS['open_bracket_delim'], end=True),
-    209: State('}', [210]), 210: State(DELIMS['close_bracket_delim'], end=True),
-    
-    211: State(',', [212]), 212: State(DELIMS['comma_equal_delim'], end=True),
-    
-    213: State(';', [214]), 214: State(DELIMS['semicolon_delim'], end=True),
+STATES = {
+    0: State('initial', [
+        143, 149, 155, 159, 165, 167, 171, 175, 179, 184, 188, 191, 194, 
+        197, 199, 201, 203, 205, 207, 209, 211, 213, 215, 262, 302, 308, 
+        314, 323
+    ]),
     
-    215: State(REGDEF['digit'], [216, 217, 245]), 
-    216: State(DELIMS['number_delim'], end=True), 
-    217: State(REGDEF['digit'], [218, 219, 245]), 
-    218: State(DELIMS['number_delim'], end=True), 
-    219: State(REGDEF['digit'], [220, 221, 245]), 
-    220: State(DELIMS['number_delim'], end=True), 
-    221: State(REGDEF['digit'], [222, 223, 245]), 
-    222: State(DELIMS['number_delim'], end=True), 
-    223: State(REGDEF['digit'], [224, 225, 245]), 
-    224: State(DELIMS['number_delim'], end=True), 
-    225: State(REGDEF['digit'], [226, 227, 245]), 
-    226: State(DELIMS['number_delim'], end=True), 
-    227: State(REGDEF['digit'], [228, 229, 245]), 
-    228: State(DELIMS['number_delim'], end=True), 
-    229: State(REGDEF['digit'], [230, 231, 245]), 
-    230: State(DELIMS['number_delim'], end=True), 
-    231: State(REGDEF['digit'], [232, 233, 245]), 
-    232: State(DELIMS['number_delim'], end=True), 
-    233: State(REGDEF['digit'], [234, 235, 245]), 
-    234: State(DELIMS['number_delim'], end=True), 
-    235: State(REGDEF['digit'], [236, 237, 245]), 
-    236: State(DELIMS['number_delim'], end=True), 
-    237: State(REGDEF['digit'], [238, 239, 245]), 
-    238: State(DELIMS['number_delim'], end=True), 
-    239: State(REGDEF['digit'], [240, 241, 245]), 
-    240: State(DELIMS['number_delim'], end=True), 
-    241: State(REGDEF['digit'], [242, 243, 245]), 
-    242: State(DELIMS['number_delim'], end=True), 
-    243: State(REGDEF['digit'], [244, 245]), 
-    244: State(DELIMS['number_delim'], end=True), 
     
+    # Operators and punctuation: the symbol itself, optionally accepted on
+    # its own, then any two-char forms ('+=', '++', ...).
+    **_operator_states(143, '+', DELIMS['arithmetic_delim'],
+                       [('+', DELIMS['unary_delim']), ('=', DELIMS['most_symbol_delim'])]),
+    # '-' may also start a negative number (215).
+    **_operator_states(149, '-', DELIMS['minus_delim'],
+                       [('-', DELIMS['unary_delim']), ('=', DELIMS['most_symbol_delim'])],
+                       tail=[215]),
+    **_operator_states(155, '*', DELIMS['arithmetic_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    **_operator_states(159, '/', DELIMS['arithmetic_delim'],
+                       [('=', DELIMS['most_symbol_delim']), ('/', DELIMS['arithmetic_delim'])]),
+    **_operator_states(165, '^', DELIMS['arithmetic_delim']),
+    **_operator_states(167, '%', DELIMS['arithmetic_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    **_operator_states(171, '=', DELIMS['comma_equal_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    **_operator_states(175, '!', DELIMS['not_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    **_operator_states(179, '<', DELIMS['most_symbol_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    **_operator_states(184, '>', DELIMS['most_symbol_delim'], [('=', DELIMS['most_symbol_delim'])]),
+    # '&', '|' and '.' only exist doubled.
+    **_operator_states(188, '&', None, [('&', DELIMS['and_or_delim'])]),
+    **_operator_states(191, '|', None, [('|', DELIMS['and_or_delim'])]),
+    **_operator_states(194, '.', None, [('.', DELIMS['string_concat_delim'])]),
+    **_operator_states(197, '#', DELIMS['string_length_delim']),
+    **_operator_states(199, '(', DELIMS['open_parenthesis_delim']),
+    **_operator_states(201, ')', DELIMS['close_parenthesis_delim']),
+    **_operator_states(203, '[', DELIMS['open_square_delim']),
+    **_operator_states(205, ']', DELIMS['close_square_delim']),
+    **_operator_states(207, '{', DELIMS['open_bracket_delim']),
+    **_operator_states(209, '}', DELIMS['close_bracket_delim']),
+    **_operator_states(211, ',', DELIMS['comma_equal_delim']),
+    **_operator_states(213, ';', DELIMS['semicolon_delim']),
+    
+    # Integer part: up to 15 digits (215-244), each may go on to the '.'.
+    **_counted_chain(215, 15, REGDEF['digit'], DELIMS['number_delim'], tail=[245]),
+    
+    # Fractional part: up to 8 digits (246-261).
     245: State('.', [246]),
-    246: State(REGDEF['digit'], [247, 248]), 247: State(DELIMS['number_delim'], end=True), 
-    248: State(REGDEF['digit'], [249, 250]), 249: State(DELIMS['number_delim'], end=True), 
-    250: State(REGDEF['digit'], [251, 252]), 251: State(DELIMS['number_delim'], end=True), 
-    252: State(REGDEF['digit'], [253, 254]), 253: State(DELIMS['number_delim'], end=True), 
-    254: State(REGDEF['digit'], [255, 256]), 255: State(DELIMS['number_delim'], end=True), 
-    256: State(REGDEF['digit'], [257, 258]), 257: State(DELIMS['number_delim'], end=True), 
-    258: State(REGDEF['digit'], [259, 260]), 259: State(DELIMS['number_delim'], end=True), 
-    260: State(REGDEF['digit'], [261]), 261: State(DELIMS['number_delim'], end=True), 
+    **_counted_chain(246, 8, REGDEF['digit'], DELIMS['number_delim']),
     
-    262: State([*REGDEF['alphabet'], '_'], [263, 264]), 
+    # Identifiers: a lowercase letter or '_' (262), then up to 19 more
+    # alphanumerics (264-301), 20 chars in all.
+    262: State(_IDENT_START, [263, 264]), 
     263: State(DELIMS['identifier_delim'], end=True),
-    
-    264: State(REGDEF['alphanumeric'], [265, 266]), 
-    265: State(DELIMS['identifier_delim'], end=True),
-    
-    266: State(REGDEF['alphanumeric'], [267, 268]), 
-    267: State(DELIMS['identifier_delim'], end=True),
-    
-    268: State(REGDEF['alphanumeric'], [269, 270]), 
-    269: State(DELIMS['identifier_delim'], end=True),
-    
-    270: State(REGDEF['alphanumeric'], [271, 272]), 
-    271: State(DELIMS['identifier_delim'], end=True),
-    
-    272: State(REGDEF['alphanumeric'], [273, 274]), 
-    273: State(DELIMS['identifier_delim'], end=True),
-    
-    274: State(REGDEF['alphanumeric'], [275, 276]), 
-    275: State(DELIMS['identifier_delim'], end=True),
-    
-    276: State(REGDEF['alphanumeric'], [277, 278]), 
-    277: State(DELIMS['identifier_delim'], end=True),
-    
-    278: State(REGDEF['alphanumeric'], [279, 280]), 
-    279: State(DELIMS['identifier_delim'], end=True),
-    
-    280: State(REGDEF['alphanumeric'], [281, 282]), 
-    281: State(DELIMS['identifier_delim'], end=True),
-    
-    282: State(REGDEF['alphanumeric'], [283, 284]), 
-    283: State(DELIMS['identifier_delim'], end=True),
-    
-    284: State(REGDEF['alphanumeric'], [285, 286]), 
-    285: State(DELIMS['identifier_delim'], end=True),
-    
-    286: State(REGDEF['alphanumeric'], [287, 288]), 
-    287: State(DELIMS['identifier_delim'], end=True),
-    
-    288: State(REGDEF['alphanumeric'], [289, 290]), 
-    289: State(DELIMS['identifier_delim'], end=True),
-    
-    290: State(REGDEF['alphanumeric'], [291, 292]), 
-    291: State(DELIMS['identifier_delim'], end=True),
-    
-    292: State(REGDEF['alphanumeric'], [293, 294]), 
-    293: State(DELIMS['identifier_delim'], end=True),
-    
-    294: State(REGDEF['alphanumeric'], [295, 296]), 
-    295: State(DELIMS['identifier_delim'], end=True),
-    
-    296: State(REGDEF['alphanumeric'], [297, 298]), 
-    297: State(DELIMS['identifier_delim'], end=True), 
-
-    298: State(REGDEF['alphanumeric'], [299, 300]), 
-    299: State(DELIMS['identifier_delim'], end=True), 
-
-    300: State(REGDEF['alphanumeric'], [301]), 
-    301: State(DELIMS['identifier_delim'], end=True), 
+    **_counted_chain(264, 19, REGDEF['alphanumeric'], DELIMS['identifier_delim']),
     
     302: State('\'', [303, 304, 306]), 
     303: State(REGDEF['ascii_298_302'], [304]), 
@@ -399,21 +222,84 @@ STATES = {
     
     323: State(':', [324]), 
     324: State(':', [325]), 
-    325: State([*REGDEF['alphanumeric'], '_'], [326, 330]), 
-    326: State([*REGDEF['alphanumeric']], [327, 330]), 
-    327: State([*REGDEF['alphanumeric']], [328, 330]), 
-    328: State([*REGDEF['alphanumeric']], [329, 330]), 
-    329: State([*REGDEF['alphanumeric']], [330]),      
+    325: State(_LABEL_START, [326, 330]), 
+    326: State(REGDEF['alphanumeric'], [327, 330]), 
+    327: State(REGDEF['alphanumeric'], [328, 330]), 
+    328: State(REGDEF['alphanumeric'], [329, 330]), 
+    329: State(REGDEF['alphanumeric'], [330]),      
     330: State(':', [331]), 
     331: State(':', [332]), 
     332: State(DELIMS['leo_delim'], end=True),
+}
+
+# STATES as a dense tuple indexed by state id, so lookups are a plain index
+# instead of a dict probe. Gaps in the numbering hold a dead state with no
+# branches that never accepts.
+_DEAD_STATE = State(set())
+STATES_LIST = tuple(STATES.get(i, _DEAD_STATE) for i in range(max(STATES) + 1))
 
-    333: State('t', [334]), 
-    334: State('a', [335]), 
-    335: State(REGDEF['free_delim'], end=True), 
+# Every identifier accept state: 263 after the first char, then the odd ids
+# of the alphanumeric chain.
+ID_END_STATES = set(range(263, 302, 2))
+
+# Flattened branch tables. Each state keeps its end branches (delimiter
+# checks) and non-end branches (transitions) as separate (id, char_mask)
+# tuples so the lexer never re-reads isEnd or re-indexes STATES per char.
+#
+# On top of that, active state sets are int bitmasks (bit i = state i), so
+# per ASCII char each state also stores the OR of the end branches that
+# accept it (end_masks) and of the branches it moves to (nonend_masks).
+for _state in set(STATES_LIST):
+    _state.end_branches = tuple(
+        (b, STATES[b].char_mask) for b in _state.branches if STATES[b].isEnd
+    )
+    _state.nonend_branches = tuple(
+        (b, STATES[b].char_mask) for b in _state.branches if not STATES[b].isEnd
+    )
+    _state.end_masks = _masks_by_char(_state.end_branches)
+    _state.nonend_masks = _masks_by_char(_state.nonend_branches)
+del _state
+
+def walk(text: str, active_states: int = 1) -> int:
+    """
+    Runs the FA over `text` (ASCII only) starting from the `active_states`
+    bitmask, which defaults to state 0. Returns the active states once the
+    whole text is consumed, or 0 if the FA died on the way.
+    """
+    for char in text:
+        next_active_states = 0
+        while active_states:
+            low = active_states & -active_states
+            next_active_states |= STATES_LIST[low.bit_length() - 1].nonend_masks[ord(char)]
+            active_states ^= low
+        active_states = next_active_states
+    return active_states
+
+# Active states right after a whole word or number, used by the lexer's
+# regex fast path to skip stepping the FA one char at a time. Words are
+# keyed by length, numbers by (integer digits, fraction digits).
+IDENT_STATES = {n: walk('_' + 'x' * (n - 1)) for n in range(1, 21)}
+NUMBER_STATES = {
+    (i, f): walk('1' * i + ('.' + '1' * f if f else ''))
+    for i in range(1, 16) for f in range(0, 9)
 }
 
-ID_END_STATES = {
-    263, 265, 267, 269, 271, 273, 275, 277, 279, 281, 
-    283, 285, 287, 289, 291, 293, 295, 297, 299, 301
-}
\ No newline at end of file
+def states_mask(state_ids) -> int:
+    """Packs a collection of state ids into a bitmask."""
+    mask = 0
+    for state_id in state_ids:
+        mask |= 1 << state_id
+    return mask
+
+def mask_states(mask: int) -> set[int]:
+    """Unpacks a bitmask back into the set of state ids it holds."""
+    state_ids = set()
+    while mask:
+        low = mask & -mask
+        state_ids.add(low.bit_length() - 1)
+        mask ^= low
+    return state_ids
+
+# Identifier end states as one mask, so "accepted only as an identifier" is
+# a single int test on the scanner's accepted-states mask.
+ID_END_MASK = states_mask(ID_END_STATES)